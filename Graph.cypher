@@ -1,218 +1,111 @@
-
-// ─────────── 1.  Wipe ───────────
-MATCH (n) DETACH DELETE n;
-
-// ─────────── 2.  Rooms & AC Units ───────────
+// ─────────── 0.  Building to load ───────────
+// Every building is its own partition: this script only wipes and reloads
+// the building named below, so several buildings can be (re)loaded
+// independently — and in parallel from separate sessions.
+// To load another site, change both params, e.g. "B2" and ".../sensor_outputs/B2".
+// The wipe (2) and CSV load (7) commit in batches with CALL … IN TRANSACTIONS,
+// which needs an auto-commit transaction: cypher-shell runs them as-is, in
+// Neo4j Browser prefix each of those two statements with `:auto`.
+:param building_id => "B1";
+:param csv_base => "https://raw.githubusercontent.com/Icy-Mint/building-graph-chatbot/refs/heads/main/sensor_outputs/B1";
+
+// ─────────── 1.  Indexes (shared, idempotent) ───────────
+CREATE INDEX building_id IF NOT EXISTS FOR (b:Building) ON (b.building_id);
+CREATE INDEX room_key    IF NOT EXISTS FOR (r:Room)     ON (r.building_id, r.room_number);
+CREATE INDEX ac_key      IF NOT EXISTS FOR (a:AC_Unit)  ON (a.building_id, a.ac_id);
+CREATE INDEX sensor_key  IF NOT EXISTS FOR (s:Sensor)   ON (s.building_id, s.sensor_id);
+CREATE INDEX reading_key IF NOT EXISTS FOR (m:Reading)  ON (m.building_id, m.sensor_type);
+
+// ─────────── 2.  Wipe this building only (batched) ───────────
+MATCH (n) WHERE n.building_id = $building_id
+CALL {
+    WITH n
+    DETACH DELETE n
+} IN TRANSACTIONS OF 10000 ROWS;
+
+// ─────────── 3.  Building, Rooms & AC Units ───────────
+CREATE (:Building {building_id: $building_id});
+
+MATCH (b:Building {building_id: $building_id})
 UNWIND range(101, 106) AS rn
-CREATE (:Room {room_number: toString(rn), type: "dorm"});
+CREATE (b)-[:HAS_ROOM]->(:Room {building_id: $building_id, room_number: toString(rn), type: "dorm"});
 
+MATCH (b:Building {building_id: $building_id})
 UNWIND [201, 202] AS rn
-CREATE (:Room {room_number: toString(rn), type: "mechanical"});
+CREATE (b)-[:HAS_ROOM]->(:Room {building_id: $building_id, room_number: toString(rn), type: "mechanical"});
 
-CREATE (ac1:AC_Unit {ac_id: "AC1"}),
-       (ac2:AC_Unit {ac_id: "AC2"});
+CREATE (ac1:AC_Unit {building_id: $building_id, ac_id: "AC1"}),
+       (ac2:AC_Unit {building_id: $building_id, ac_id: "AC2"});
 
 // Mechanical rooms *contain* the AC units
-MATCH (mech:Room {room_number: "201"}), (ac1:AC_Unit {ac_id: "AC1"})
+MATCH (mech:Room {building_id: $building_id, room_number: "201"}),
+      (ac1:AC_Unit {building_id: $building_id, ac_id: "AC1"})
 CREATE (mech)-[:CONTAINS]->(ac1);
 
-MATCH (mech:Room {room_number: "202"}), (ac2:AC_Unit {ac_id: "AC2"})
+MATCH (mech:Room {building_id: $building_id, room_number: "202"}),
+      (ac2:AC_Unit {building_id: $building_id, ac_id: "AC2"})
 CREATE (mech)-[:CONTAINS]->(ac2);
 
-// ─────────── 3.  AC units SERVICE dorm rooms ───────────
-MATCH (ac1:AC_Unit {ac_id: "AC1"})
-MATCH (r:Room) WHERE r.room_number IN ["101","102","103"]
+// ─────────── 4.  AC units SERVICE dorm rooms ───────────
+MATCH (ac1:AC_Unit {building_id: $building_id, ac_id: "AC1"})
+MATCH (r:Room {building_id: $building_id}) WHERE r.room_number IN ["101","102","103"]
 CREATE (ac1)-[:SERVICES]->(r);
 
-MATCH (ac2:AC_Unit {ac_id: "AC2"})
-MATCH (r:Room) WHERE r.room_number IN ["104","105","106"]
+MATCH (ac2:AC_Unit {building_id: $building_id, ac_id: "AC2"})
+MATCH (r:Room {building_id: $building_id}) WHERE r.room_number IN ["104","105","106"]
 CREATE (ac2)-[:SERVICES]->(r);
 
-// ─────────── 4.  Sensors ───────────
-MATCH (r:Room) WHERE r.type = "dorm"
+// ─────────── 5.  Sensors ───────────
+MATCH (r:Room {building_id: $building_id}) WHERE r.type = "dorm"
 WITH r
-CREATE (occ:Sensor  {sensor_id: "OCC_"  + r.room_number, sensor_type: "occupancy"}),
-       (temp:Sensor {sensor_id: "TEMP_" + r.room_number, sensor_type: "temperature"}),
+CREATE (occ:Sensor  {building_id: $building_id, sensor_id: "OCC_"  + r.room_number, sensor_type: "occupancy"}),
+       (temp:Sensor {building_id: $building_id, sensor_id: "TEMP_" + r.room_number, sensor_type: "temperature"}),
        (r)-[:HAS_SENSOR]->(occ),
        (r)-[:HAS_SENSOR]->(temp);
 
-// ─────────── 5.  Temp sensors REPORT_TO their AC unit ───────────
-MATCH (ac:AC_Unit)-[:SERVICES]->(r:Room)-[:HAS_SENSOR]->(s:Sensor {sensor_type:"temperature"})
+// ─────────── 6.  Temp sensors REPORT_TO their AC unit ───────────
+MATCH (ac:AC_Unit {building_id: $building_id})-[:SERVICES]->(r:Room)
+      -[:HAS_SENSOR]->(s:Sensor {sensor_type:"temperature"})
 CREATE (s)-[:REPORTS_TO]->(ac);
 
-// ─────────── 6.  CSV loads ───────────
-
-LOAD CSV WITH HEADERS FROM "https://raw.githubusercontent.com/Icy-Mint/building-graph-chatbot/refs/heads/main/sensor_outputs/room_101_timeseries.csv" AS row
-WITH row,
-     toFloat(row.temperature) AS tempVal,
-     toInteger(row.occupancy) AS occVal,
-     datetime(replace(row.timestamp, " ", "T")) AS ts
-
-// Match the temperature and occupancy sensors
-MATCH (tempSensor:Sensor {sensor_id: row.sensor_id_temp})
-MATCH (occSensor:Sensor {sensor_id: row.sensor_id_occ})
-
-// Create temperature reading and link to sensor
-CREATE (tempReading:Reading {
-    timestamp: ts,
-    value: tempVal,
-    sensor_type: "temperature",
-    room_number: row.room_number
-})
-CREATE (tempSensor)-[:RECORDED]->(tempReading)
-
-// Create occupancy reading and link to sensor
-CREATE (occReading:Reading {
-    timestamp: ts,
-    value: occVal,
-    sensor_type: "occupancy",
-    room_number: row.room_number
-})
-CREATE (occSensor)-[:RECORDED]->(occReading);
-
-// for other rooms 
-
-LOAD CSV WITH HEADERS FROM "https://raw.githubusercontent.com/Icy-Mint/building-graph-chatbot/refs/heads/main/sensor_outputs/room_102_timeseries.csv" AS row
-WITH row,
-     toFloat(row.temperature) AS tempVal,
-     toInteger(row.occupancy) AS occVal,
-     datetime(replace(row.timestamp, " ", "T")) AS ts
-
-// Match the temperature and occupancy sensors
-MATCH (tempSensor:Sensor {sensor_id: row.sensor_id_temp})
-MATCH (occSensor:Sensor {sensor_id: row.sensor_id_occ})
-
-// Create temperature reading and link to sensor
-CREATE (tempReading:Reading {
-    timestamp: ts,
-    value: tempVal,
-    sensor_type: "temperature",
-    room_number: row.room_number
-})
-CREATE (tempSensor)-[:RECORDED]->(tempReading)
-
-// Create occupancy reading and link to sensor
-CREATE (occReading:Reading {
-    timestamp: ts,
-    value: occVal,
-    sensor_type: "occupancy",
-    room_number: row.room_number
-})
-CREATE (occSensor)-[:RECORDED]->(occReading);
-
-
-
-LOAD CSV WITH HEADERS FROM "https://raw.githubusercontent.com/Icy-Mint/building-graph-chatbot/refs/heads/main/sensor_outputs/room_103_timeseries.csv" AS row
-WITH row,
-     toFloat(row.temperature) AS tempVal,
-     toInteger(row.occupancy) AS occVal,
-     datetime(replace(row.timestamp, " ", "T")) AS ts
-
-// Match the temperature and occupancy sensors
-MATCH (tempSensor:Sensor {sensor_id: row.sensor_id_temp})
-MATCH (occSensor:Sensor {sensor_id: row.sensor_id_occ})
-
-// Create temperature reading and link to sensor
-CREATE (tempReading:Reading {
-    timestamp: ts,
-    value: tempVal,
-    sensor_type: "temperature",
-    room_number: row.room_number
-})
-CREATE (tempSensor)-[:RECORDED]->(tempReading)
-
-// Create occupancy reading and link to sensor
-CREATE (occReading:Reading {
-    timestamp: ts,
-    value: occVal,
-    sensor_type: "occupancy",
-    room_number: row.room_number
-})
-CREATE (occSensor)-[:RECORDED]->(occReading);
-
-
-LOAD CSV WITH HEADERS FROM "https://raw.githubusercontent.com/Icy-Mint/building-graph-chatbot/refs/heads/main/sensor_outputs/room_104_timeseries.csv" AS row
-WITH row,
-     toFloat(row.temperature) AS tempVal,
-     toInteger(row.occupancy) AS occVal,
-     datetime(replace(row.timestamp, " ", "T")) AS ts
-
-// Match the temperature and occupancy sensors
-MATCH (tempSensor:Sensor {sensor_id: row.sensor_id_temp})
-MATCH (occSensor:Sensor {sensor_id: row.sensor_id_occ})
-
-// Create temperature reading and link to sensor
-CREATE (tempReading:Reading {
-    timestamp: ts,
-    value: tempVal,
-    sensor_type: "temperature",
-    room_number: row.room_number
-})
-CREATE (tempSensor)-[:RECORDED]->(tempReading)
-
-// Create occupancy reading and link to sensor
-CREATE (occReading:Reading {
-    timestamp: ts,
-    value: occVal,
-    sensor_type: "occupancy",
-    room_number: row.room_number
-})
-CREATE (occSensor)-[:RECORDED]->(occReading);
-
-
-LOAD CSV WITH HEADERS FROM "https://raw.githubusercontent.com/Icy-Mint/building-graph-chatbot/refs/heads/main/sensor_outputs/room_105_timeseries.csv" AS row
-WITH row,
-     toFloat(row.temperature) AS tempVal,
-     toInteger(row.occupancy) AS occVal,
-     datetime(replace(row.timestamp, " ", "T")) AS ts
-
-// Match the temperature and occupancy sensors
-MATCH (tempSensor:Sensor {sensor_id: row.sensor_id_temp})
-MATCH (occSensor:Sensor {sensor_id: row.sensor_id_occ})
-
-// Create temperature reading and link to sensor
-CREATE (tempReading:Reading {
-    timestamp: ts,
-    value: tempVal,
-    sensor_type: "temperature",
-    room_number: row.room_number
-})
-CREATE (tempSensor)-[:RECORDED]->(tempReading)
-
-// Create occupancy reading and link to sensor
-CREATE (occReading:Reading {
-    timestamp: ts,
-    value: occVal,
-    sensor_type: "occupancy",
-    room_number: row.room_number
-})
-CREATE (occSensor)-[:RECORDED]->(occReading);
-
-
-LOAD CSV WITH HEADERS FROM "https://raw.githubusercontent.com/Icy-Mint/building-graph-chatbot/refs/heads/main/sensor_outputs/room_106_timeseries.csv" AS row
-WITH row,
-     toFloat(row.temperature) AS tempVal,
-     toInteger(row.occupancy) AS occVal,
-     datetime(replace(row.timestamp, " ", "T")) AS ts
-
-// Match the temperature and occupancy sensors
-MATCH (tempSensor:Sensor {sensor_id: row.sensor_id_temp})
-MATCH (occSensor:Sensor {sensor_id: row.sensor_id_occ})
-
-// Create temperature reading and link to sensor
-CREATE (tempReading:Reading {
-    timestamp: ts,
-    value: tempVal,
-    sensor_type: "temperature",
-    room_number: row.room_number
-})
-CREATE (tempSensor)-[:RECORDED]->(tempReading)
-
-// Create occupancy reading and link to sensor
-CREATE (occReading:Reading {
-    timestamp: ts,
-    value: occVal,
-    sensor_type: "occupancy",
-    room_number: row.room_number
-})
-CREATE (occSensor)-[:RECORDED]->(occReading);
+// ─────────── 7.  CSV loads (one file per dorm room, batched) ───────────
+MATCH (r:Room {building_id: $building_id, type: "dorm"})
+WITH collect(r.room_number) AS rooms
+UNWIND rooms AS rn
+LOAD CSV WITH HEADERS FROM $csv_base + "/room_" + rn + "_timeseries.csv" AS row
+CALL {
+    WITH row
+    WITH row,
+         toFloat(row.temperature) AS tempVal,
+         toInteger(row.occupancy) AS occVal,
+         datetime(replace(row.timestamp, " ", "T")) AS ts
+
+    // Match the temperature and occupancy sensors of *this* building
+    MATCH (tempSensor:Sensor {building_id: $building_id, sensor_id: row.sensor_id_temp})
+    MATCH (occSensor:Sensor  {building_id: $building_id, sensor_id: row.sensor_id_occ})
+
+    // Create temperature reading and link to sensor
+    CREATE (tempReading:Reading {
+        building_id: $building_id,
+        timestamp: ts,
+        value: tempVal,
+        sensor_type: "temperature",
+        room_number: row.room_number
+    })
+    CREATE (tempSensor)-[:RECORDED]->(tempReading)
+
+    // Create occupancy reading and link to sensor
+    CREATE (occReading:Reading {
+        building_id: $building_id,
+        timestamp: ts,
+        value: occVal,
+        sensor_type: "occupancy",
+        room_number: row.room_number
+    })
+    CREATE (occSensor)-[:RECORDED]->(occReading)
+} IN TRANSACTIONS OF 5000 ROWS;
+
+// ─────────── 8.  Stamp the load ───────────
+// Set last, so apps caching per-building results (chatbot.py) rebuild them
+MATCH (b:Building {building_id: $building_id})
+SET b.loaded_at = datetime();
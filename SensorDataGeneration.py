@@ -2,8 +2,12 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 # === Setup ===
+# Building / site ids to generate, e.g. `python SensorDataGeneration.py B1 B2 B3`
+buildings = sys.argv[1:] or ["B1"]
 dorm_rooms = [f"{i}" for i in range(101, 107)]
 start_time = datetime(2024, 1, 1, 0, 0, 0)
 end_time = start_time + timedelta(days=7)
@@ -38,27 +42,38 @@ def generate_temperature_series(is_sunny_side):
     ) for i in range(len(time_range))]
 
 # === Output Directory ===
+# One partition folder per building: sensor_outputs/<building>/room_<n>_timeseries.csv
 output_dir = "sensor_outputs"
-os.makedirs(output_dir, exist_ok=True)
 
 # === Generate + Save CSV per Room ===
-for i, room in enumerate(dorm_rooms):
-    profile_func = full_time_student if i % 2 == 0 else night_worker
-    is_sunny = i < 3  # Rooms 101–103 are sunny side
-    temperature_series = generate_temperature_series(is_sunny)
-    
-    data = []
-    for j, ts in enumerate(time_range):
-        data.append({
-            "timestamp": ts,
-            "room_number": room,
-            "sensor_id_occ": f"OCC_{room}",
-            "sensor_id_temp": f"TEMP_{room}",
-            "occupancy": profile_func(ts),
-            "temperature": temperature_series[j]
-        })
+def generate_building(building):
+    np.random.seed()  # fresh noise per worker process, not the forked parent state
+    building_dir = os.path.join(output_dir, building)
+    os.makedirs(building_dir, exist_ok=True)
 
-    df_room = pd.DataFrame(data)
-    df_room.to_csv(f"{output_dir}/room_{room}_timeseries.csv", index=False)
+    for i, room in enumerate(dorm_rooms):
+        profile_func = full_time_student if i % 2 == 0 else night_worker
+        is_sunny = i < 3  # Rooms 101–103 are sunny side
+        temperature_series = generate_temperature_series(is_sunny)
 
-print(f" Done! Files saved in: ./{output_dir}/")
+        data = []
+        for j, ts in enumerate(time_range):
+            data.append({
+                "timestamp": ts,
+                "room_number": room,
+                "sensor_id_occ": f"OCC_{room}",
+                "sensor_id_temp": f"TEMP_{room}",
+                "occupancy": profile_func(ts),
+                "temperature": temperature_series[j]
+            })
+
+        df_room = pd.DataFrame(data)
+        df_room.to_csv(f"{building_dir}/room_{room}_timeseries.csv", index=False)
+    return building_dir
+
+
+if __name__ == "__main__":
+    # Buildings are independent partitions, so generate them in parallel
+    with ProcessPoolExecutor() as pool:
+        for building_dir in pool.map(generate_building, buildings):
+            print(f" Done! Files saved in: ./{building_dir}/")
@@ -0,0 +1,95 @@
+"""
+Benchmark: per-AC-unit comfort metrics at 1,000 rooms × 1 month (5-min data).
+
+Compares lib/comfort_analytics.py against the straightforward pandas
+approach (concat each unit's room tables, filter, aggregate) and checks
+both give the same numbers.
+
+    python benchmarks/bench_comfort.py [n_rooms] [days]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from lib.comfort_analytics import ComfortAnalytics, DEFAULT_THRESHOLD  # noqa: E402
+
+N_ROOMS = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+DAYS = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+ROOMS_PER_UNIT = 40
+
+
+# === Synthetic data, same shape as SensorDataGeneration.py output ===
+def make_tables(n_rooms, days, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.date_range("2024-01-01", periods=days * 288, freq="5min")
+    minute = (ts.hour * 60 + ts.minute).to_numpy()
+    base = 22 + 4 * np.sin(2 * np.pi * minute / 1440)
+    tables = {}
+    for i in range(n_rooms):
+        room = str(1001 + i)
+        tables[room] = pd.DataFrame({
+            "timestamp": ts,
+            "room_number": room,
+            "occupancy": (rng.random(len(ts)) < 0.45).astype(int),
+            "temperature": np.round(base + 2 * (i % 2) + rng.normal(0, 0.5, len(ts)), 2),
+        })
+    return tables
+
+
+def make_services(rooms):
+    return {
+        f"AC{u + 1}": rooms[i:i + ROOMS_PER_UNIT]
+        for u, i in enumerate(range(0, len(rooms), ROOMS_PER_UNIT))
+    }
+
+
+# === Baseline: one pandas pass per AC unit ===
+def pandas_metrics(tables, services, start, end, threshold):
+    out = {}
+    for unit, rooms in services.items():
+        df = pd.concat([tables[r] for r in rooms])
+        df = df[(df.timestamp >= start) & (df.timestamp < end)]
+        occ = df.occupancy == 1
+        out[unit] = {
+            "occupied_hours": occ.sum() / 12,
+            "hot_occupied_hours": (occ & (df.temperature > threshold)).sum() / 12,
+            "degree_hours": ((df.temperature - threshold).clip(lower=0) * occ).sum() / 12,
+            "mean_occupied_temp": df.temperature[occ].mean(),
+            "peak_temp": df.temperature.max(),
+        }
+    return pd.DataFrame.from_dict(out, orient="index")
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    print(f"Generating {N_ROOMS} rooms × {DAYS} days …")
+    tables = make_tables(N_ROOMS, DAYS)
+    services = make_services(sorted(tables))
+
+    engine, t_build = timed(ComfortAnalytics, tables, services)
+    start, end = engine.window(7)          # "this week"
+    fast, t_cold = timed(engine.metrics, start, end, DEFAULT_THRESHOLD)
+    _, t_warm = timed(engine.metrics, start, end, DEFAULT_THRESHOLD)
+    _, t_month = timed(engine.metrics, *engine.window(), DEFAULT_THRESHOLD)
+    slow, t_pandas = timed(pandas_metrics, tables, services, start, end, DEFAULT_THRESHOLD)
+
+    cols = list(slow.columns)
+    assert np.allclose(fast.loc[slow.index, cols].to_numpy(), slow.to_numpy()), "results differ"
+
+    print(f"matrix shape              : {engine.temp.shape} ({len(services)} AC units)")
+    print(f"align (one-off)           : {t_build * 1e3:9.1f} ms")
+    print(f"metrics, last 7 days      : {t_cold * 1e3:9.1f} ms")
+    print(f"metrics, cached           : {t_warm * 1e3:9.3f} ms")
+    print(f"metrics, full {DAYS:>2} days     : {t_month * 1e3:9.1f} ms")
+    print(f"pandas per-unit, 7 days   : {t_pandas * 1e3:9.1f} ms  "
+          f"({t_pandas / t_cold:.0f}× slower)")
+    print("results match ✔")
@@ -1,4 +1,4 @@
-import os, glob
+import os, re, glob
 import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
@@ -7,6 +7,8 @@ from langchain_openai import ChatOpenAI
 from langchain.chains import LLMChain
 from langchain.prompts import PromptTemplate
 from langchain.output_parsers import StructuredOutputParser, ResponseSchema
+from lib.sensor_store import SensorStore, normalize_ac_unit, normalize_building
+from lib.comfort_analytics import ComfortAnalytics, DEFAULT_THRESHOLD
 
 # ────────────────────────────────
 # 1.  CONFIG
@@ -21,26 +23,83 @@ NEO4J_PASS = os.getenv("NEO4J_PASSWORD")
 driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASS))
 
 class GraphHelper:
-    def __call__(self, cypher: str):
+    def __call__(self, cypher: str, **params):
         try:
             with driver.session() as s:
-                return [r.data() for r in s.run(cypher)]
+                return [r.data() for r in s.run(cypher, **params)]
         except Exception as e:
             return f"⚠️ Cypher error : {e}"
 
+@st.cache_resource
+def get_store():
+    # One store per server process so loaded buildings stay cached across reruns
+    return SensorStore()
+
+def get_comfort(store, building, loaded_at=None):
+    # Aligned matrices + per-window results for one building, cached with the
+    # building in the store: evicting it, rewriting its CSVs or reloading it
+    # through Graph.cypher (new loaded_at) all rebuild the engine
+    def build(tables):
+        services = GraphHelper()("""
+        MATCH (a:AC_Unit {building_id: $building})-[:SERVICES]->(r:Room)
+        RETURN a.ac_id AS ac_unit, collect(r.room_number) AS rooms
+        """, building=building)
+        if not isinstance(services, list):
+            raise RuntimeError(services)
+        return ComfortAnalytics(tables, {row["ac_unit"]: row["rooms"] for row in services})
+
+    return store.derived(building, "comfort", build, key=loaded_at)
+
+def scope(building):
+    """Buildings a question touches: the one it names, or all of them."""
+    return [building] if building else get_store().buildings()
+
+def parse_number(value):
+    """26 / "26" / "26 °C" / "7 days" → float; None or no number → None."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = re.search(r"-?\d+(?:\.\d+)?", str(value))
+    return float(m.group()) if m else None
+
+def comfort_metrics(buildings, days=None, threshold=DEFAULT_THRESHOLD):
+    """Per-AC-unit metrics for the given buildings, merged.  `days` counts back
+    from each building's last reading; start / end columns hold that window."""
+    loaded = GraphHelper()("""
+    MATCH (b:Building) WHERE b.building_id IN $buildings
+    RETURN b.building_id AS building, toString(b.loaded_at) AS loaded_at
+    """, buildings=buildings)
+    if not isinstance(loaded, list):
+        raise RuntimeError(loaded)
+    loaded_at = {row["building"]: row["loaded_at"] for row in loaded}
+
+    def building_metrics(b):
+        engine = get_comfort(store, b, loaded_at.get(b))
+        start, end = engine.window(days)
+        return engine.metrics(start, end, threshold).assign(start=start, end=end)
+
+    # Engines of several buildings are loaded / built in parallel
+    store = get_store()
+    frames = dict(zip(buildings, store.fan_out(building_metrics, buildings)))
+    return pd.concat(frames, names=["building"]) if frames else pd.DataFrame()
+
 class SensorHelper:
-    def __init__(self, folder="sensor_outputs"):
-        self.tables = {
-            f.split("_")[1]: pd.read_csv(os.path.join(folder, f), parse_dates=["timestamp"])
-            for f in os.listdir(folder) if f.endswith(".csv")
-        }
+    """Room-level answers over one building's tables; `building` labels the
+    lines when answers from several buildings are merged."""
+    def __init__(self, tables, building=None):
+        self.tables = tables
+        self.building = building
+
+    def _label(self, room):
+        return f"Room {room}" if self.building is None else f"{self.building} room {room}"
 
     def hottest(self, room):
         df = self.tables.get(room)
         if df is None:
             return f"No temperature data for room {room}"
         peak = df.loc[df.temperature.idxmax()]
-        return (f"Room {room} peaked at {peak.temperature:.1f} °C "
+        return (f"{self._label(room)} peaked at {peak.temperature:.1f} °C "
                 f"on {peak.timestamp.strftime('%Y-%m-%d %H:%M')}")
 
     def occupancy_pattern(self, room):
@@ -51,14 +110,14 @@ class SensorHelper:
         if occ_by_hour.empty:
             return f"No occupancy detected in room {room}"
         hours = ", ".join(str(h) + ":00" for h in occ_by_hour.index)
-        return f"Room {room} is typically occupied during: {hours}"
+        return f"{self._label(room)} is typically occupied during: {hours}"
     
     def coldest(self, room):
         df = self.tables.get(room)
         if df is None:
             return f"No temperature data for room {room}"
         low = df.loc[df.temperature.idxmin()]
-        return (f"Room {room} reached lowest temperature {low.temperature:.1f} °C "
+        return (f"{self._label(room)} reached lowest temperature {low.temperature:.1f} °C "
                 f"on {low.timestamp.strftime('%Y-%m-%d %H:%M')}")
 
 
@@ -67,8 +126,12 @@ llm = ChatOpenAI(openai_api_key=OPENAI_API_KEY, temperature=0)
 
 # Structured output parsing schema
 response_schemas = [
-    ResponseSchema(name="action", description="One of: hottest, coldest, occupancy, ac_mapping, fallback"),
-    ResponseSchema(name="room", description="Room number if mentioned, else null")
+    ResponseSchema(name="action", description="One of: hottest, coldest, occupancy, ac_mapping, ac_comfort, ac_ranking, fallback"),
+    ResponseSchema(name="room", description="Room number if mentioned, else null"),
+    ResponseSchema(name="building", description="Building / site id if mentioned (e.g. B1, B2), else null"),
+    ResponseSchema(name="ac_unit", description="AC unit id if mentioned (e.g. AC1), else null"),
+    ResponseSchema(name="threshold", description="Temperature threshold in °C if mentioned, else null"),
+    ResponseSchema(name="days", description="Length of the time window in days if mentioned (this week → 7, today → 1), else null")
 ]
 parser = StructuredOutputParser.from_response_schemas(response_schemas)
 
@@ -81,7 +144,10 @@ Classify the user question into one of the following actions:
 - coldest: user asks about lowest, coldest, coolest, min temperature
 - occupancy: user asks about room usage or occupancy patterns
 - ac_mapping: user asks which AC unit services which rooms
+- ac_comfort: user asks about comfort or utilization of the rooms an AC unit serves (degree-hours, hot hours, occupied hours)
+- ac_ranking: user asks which AC unit serves the most occupied-but-hot (or most used) rooms
 - fallback: all other questions
+Buildings are identified as B1, B2, ... ("building 2", "site 2" → B2).
 
 {format_instructions}
 
@@ -105,46 +171,97 @@ Answer the following user question based on building layout and sensor data:
 # ───── Chatbot Entry Point ─────
 def ask(query):
     gh = GraphHelper()
-    sh = SensorHelper()
 
     try:
         parsed = parser.parse(classification_chain.run(question=query))
         action = parsed['action']
         room = parsed.get('room')
+        building = normalize_building(parsed.get('building'))
 
-        if action == "hottest":
-            if room and room in sh.tables:
-                return sh.hottest(room)
-            else:
-                return "\n".join([sh.hottest(r) for r in sh.tables.keys()])
+        # A named building is never widened to the others, even if unknown
+        if action != "fallback" and building and building not in get_store().buildings():
+            return f"No sensor data for building {building}"
 
-        elif action == "coldest":
-            if room and room in sh.tables:
-                return sh.coldest(room)
-            else:
-                return "\n".join([sh.coldest(r) for r in sh.tables.keys()])
+        if action in ("hottest", "coldest", "occupancy"):
+            # Only the requested building's partition is loaded; otherwise fan
+            # out over the buildings in parallel, a few partitions at a time
+            store = get_store()
+            buildings = scope(building)
+            if not any(room in store.rooms(b) for b in buildings):
+                room = None                   # no such room → answer for every room
 
-        elif action == "occupancy":
-            if room and room in sh.tables:
-                return sh.occupancy_pattern(room)
-            else:
-                return "\n".join([sh.occupancy_pattern(r) for r in sh.tables.keys()])
+            def answer_building(b):
+                rooms = store.rooms(b)
+                if room is not None and room not in rooms:
+                    return []                 # skip without reading the partition
+                sh = SensorHelper(store.tables(b), None if building else b)
+                answer = {
+                    "hottest": sh.hottest,
+                    "coldest": sh.coldest,
+                    "occupancy": sh.occupancy_pattern,
+                }[action]
+                return [answer(r) for r in ([room] if room else rooms)]
+
+            return "\n".join(
+                line for lines in store.fan_out(answer_building, buildings) for line in lines
+            )
 
         elif action == "ac_mapping":
             result = gh("""
             MATCH (a:AC_Unit)-[:SERVICES]->(r:Room)
-            RETURN a.ac_id AS ac_unit, collect(r.room_number) AS rooms
-            ORDER BY a.ac_id
-            """)
+            WHERE $building IS NULL OR a.building_id = $building
+            RETURN a.building_id AS building, a.ac_id AS ac_unit,
+                   collect(r.room_number) AS rooms
+            ORDER BY building, ac_unit
+            """, building=building)
             if not isinstance(result, list):
                 return result
             if len(result) == 0:
                 return "I couldn’t find any AC-unit to room mapping."
             return "\n".join(
-                f"AC unit {row['ac_unit']} serves rooms: {', '.join(map(str, row['rooms']))}."
+                f"{row['building']} AC unit {row['ac_unit']} serves rooms: {', '.join(map(str, row['rooms']))}."
                 for row in result
             )
 
+        elif action in ("ac_comfort", "ac_ranking"):
+            threshold = parse_number(parsed.get('threshold'))
+            if threshold is None:
+                threshold = DEFAULT_THRESHOLD
+            days = parse_number(parsed.get('days'))
+            if days is not None and days <= 0:
+                days = None                   # "0 days" / "-7" → no window given
+            df = comfort_metrics(scope(building), days, threshold)
+            if df.empty:
+                return "I couldn’t find any AC unit with sensor data."
+
+            def window(row):
+                # The data's own window, which need not end today
+                return f"{row.start:%Y-%m-%d %H:%M} → {row.end:%Y-%m-%d %H:%M}"
+
+            if action == "ac_ranking":
+                df = df.sort_values("hot_occupied_hours", ascending=False)
+                (b, unit), top = next(df.iterrows())
+                if top.hot_occupied_hours == 0:
+                    return (f"No AC unit served an occupied room above {threshold:.1f} °C "
+                            f"over {window(top)}.")
+                lines = [f"{b} {unit} serves the most occupied-but-hot room-hours above "
+                         f"{threshold:.1f} °C over {window(top)}: {top.hot_occupied_hours:.1f} h."]
+            else:
+                ac_unit = normalize_ac_unit(parsed.get('ac_unit'))
+                if ac_unit:
+                    df = df[df.index.get_level_values("ac_unit") == ac_unit]
+                    if df.empty:
+                        return f"No sensor data for rooms served by {ac_unit}"
+                lines = [f"Above {threshold:.1f} °C while occupied:"]
+
+            lines += [
+                f"{b} {unit} ({int(row.rooms)} rooms, {window(row)}): {row.degree_hours:.1f} degree-hours, "
+                f"{row.hot_occupied_hours:.1f} occupied-but-hot room-hours, "
+                f"{row.utilization:.0%} utilization"
+                for (b, unit), row in df.iterrows()
+            ]
+            return "\n".join(lines)
+
         else:
             return fallback_chain.run(question=query)
 
@@ -5,6 +5,7 @@ from langchain_openai import ChatOpenAI
 from langchain_community.graphs import Neo4jGraph
 from langchain_community.chains.graph_qa.cypher import GraphCypherQAChain
 from langchain.prompts import PromptTemplate
+from lib.sensor_store import normalize_building
 
 # Add a better system prompt that includes the schema
 from langchain.prompts import PromptTemplate
@@ -34,13 +35,18 @@ llm = ChatOpenAI(
 # add database schema to guide the cipher generation 
 schema = """
 Node Labels:
-- Room: properties room_number (string), type ('dorm' or 'mechanical')
-- AC_Unit: properties ac_id (string, values like 'AC1', 'AC2')
+- Building: properties building_id (string, values like 'B1', 'B2'), loaded_at (datetime of the last Graph.cypher load)
+- Room: properties building_id, room_number (string), type ('dorm' or 'mechanical')
+- AC_Unit: properties building_id, ac_id (string, values like 'AC1', 'AC2')
 - Room (property: room_number, example values: '101', '102', '103')
-- Sensor: properties sensor_id (string), sensor_type ('occupancy' or 'temperature')
-- Reading: properties timestamp, value
+- Sensor: properties building_id, sensor_id (string), sensor_type ('occupancy' or 'temperature')
+- Reading: properties building_id, timestamp, value
+
+Every node, Building included, carries building_id. Room numbers, AC ids and
+sensor ids repeat across buildings, so they are only unique together with building_id.
 
 Relationships:
+- (Building)-[:HAS_ROOM]->(Room): Rooms belong to one building.
 - (Room)-[:CONTAINS]->(AC_Unit): Mechanical rooms contain AC units.
 - (AC_Unit)-[:SERVICES]->(Room): AC units service dorm rooms.
 - (Room)-[:HAS_SENSOR]->(Sensor): Rooms have sensors.
@@ -56,6 +62,10 @@ RETURN r.room_number
 User: What rooms are serviced by air conditioning unit 2?
 MATCH (a:AC_Unit {{ac_id:'AC2'}})-[:SERVICES]->(r:Room)
 RETURN r.room_number
+
+User: Which rooms does AC1 serve in building 2?
+MATCH (a:AC_Unit {{building_id:'B2', ac_id:'AC1'}})-[:SERVICES]->(r:Room)
+RETURN r.room_number
 """
 
 # ---- build one resolved string, but keep {{question}} placeholder ----------
@@ -68,6 +78,8 @@ The database schema is:
 
 Guidelines:
 •  When the user says "air conditioning unit N", "AC N", "acN", "ac N", etc., map it to ac_id = 'ACN'.
+•  When the user says "building N", "site N", "bN", etc., map it to building_id = 'BN' and filter every node on it.
+•  If no building is mentioned, do not filter on building_id and return building_id alongside room_number / ac_id.
 •  Use relationship directions exactly as shown.
 •  Use correct property names (e.g. ac_id, room_number, sensor_id).
 •  If the question can't be answered with the schema, reply ONLY: "Cannot answer with the current schema."
@@ -93,6 +105,13 @@ chain = GraphCypherQAChain.from_llm(
 
 
 FORECAST_WORDS = re.compile(r"\b(forecast|predict|projection|trend)\b", re.I)
+BUILDING_WORDS = re.compile(r"\b(?:building|site)\s*#?(\d+)\b|\bB(\d+)\b", re.I)
+
+
+def building_of(question):
+    """'building 2' / 'site 2' / 'B2' → 'B2', else None (= all buildings)."""
+    m = BUILDING_WORDS.search(question)
+    return normalize_building(m.group(1) or m.group(2)) if m else None
 
 # ─────────────────────────────────────────
 # 2.  STREAMLIT UI
@@ -143,15 +162,18 @@ if user_q:
 
             st.warning("⛅️Forecasting isn't a pure Cypher lookup; fetching history…")
 
+            building = building_of(user_q)   # None → fan out over every building
             with st.spinner("Querying Neo4j…"):
                 rows = graph.query(
                     """
                     MATCH (d:Room)-[:HAS_SENSOR]->(:Sensor {sensor_type:'occupancy'})
                           -[:RECORDED]->(m:Reading {sensor_type:'occupancy'})
-                    RETURN d.room_number AS room,
+                    WHERE $building IS NULL OR d.building_id = $building
+                    RETURN d.building_id + '/' + d.room_number AS room,
                            toString(m.timestamp) AS ts,
                            m.value               AS occ   // 0=vacant, 1=occupied
-                    """
+                    """,
+                    {"building": building},
                 )
 
             if not rows:
@@ -0,0 +1,144 @@
+"""
+Per-AC-unit comfort and utilization analytics.
+
+The per-room CSV tables of one building are aligned on a shared time index
+into two (rooms × time) matrices — temperature and occupancy.  Rooms are
+grouped by the AC unit that SERVICES them (from the graph) through a
+(units × rooms) membership matrix, so the metrics of every unit come out
+of one vectorized pass: reduce each room along time, then one matrix
+product rolls rooms up to units.  Results are cached per time window.
+
+Missing samples are NaN temperature / unoccupied, so they never count as
+occupied or hot.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_THRESHOLD = 26.0   # °C
+MAX_CACHED_WINDOWS = 32    # (window, threshold) results kept per engine
+
+# Columns of ComfortAnalytics.metrics(), in order
+METRICS = [
+    "rooms",                # rooms served that have sensor data
+    "occupied_hours",       # Σ room-hours with occupancy == 1
+    "utilization",          # occupied_hours / (rooms × window hours)
+    "hot_occupied_hours",   # Σ room-hours occupied AND above threshold
+    "degree_hours",         # Σ (temperature − threshold)+ × hours, while occupied
+    "mean_occupied_temp",   # mean temperature over occupied samples
+    "peak_temp",            # max temperature in the window
+]
+
+
+class ComfortAnalytics:
+    def __init__(self, tables, services):
+        """
+        tables   – {room: DataFrame with timestamp, occupancy, temperature}
+        services – {ac_id: [room, ...]}, i.e. the SERVICES edges of the graph
+        """
+        self.rooms = sorted(tables)
+        self.index, self.temp, self.occ = self._align(tables, self.rooms)
+
+        steps = np.diff(self.index.asi8)
+        self.step_hours = float(np.median(steps)) / 3.6e12 if len(steps) else 0.0
+
+        pos = {room: i for i, room in enumerate(self.rooms)}
+        self.units = sorted(services)
+        self.membership = np.zeros((len(self.units), len(self.rooms)))
+        for u, unit in enumerate(self.units):
+            for room in services[unit]:
+                if room in pos:
+                    self.membership[u, pos[room]] = 1.0
+
+        self._cache = OrderedDict()         # (lo, hi, threshold) → DataFrame, LRU
+
+    @staticmethod
+    def _align(tables, rooms):
+        """Scatter every room's series onto the union of all timestamps."""
+        stamps = [tables[r]["timestamp"].to_numpy("datetime64[ns]") for r in rooms]
+        # Usual case: every room sampled on the same clock, no union needed
+        shared = bool(stamps) and np.all(np.diff(stamps[0]) > 0) and all(
+            np.array_equal(stamps[0], ts) for ts in stamps
+        )
+        if shared:
+            index = stamps[0]
+        elif stamps:
+            index = np.unique(np.concatenate(stamps))
+        else:
+            index = np.array([], "datetime64[ns]")
+
+        temp = np.full((len(rooms), len(index)), np.nan)
+        occ = np.zeros((len(rooms), len(index)), dtype=bool)
+        for i, (room, ts) in enumerate(zip(rooms, stamps)):
+            df = tables[room]
+            cols = slice(None) if shared else np.searchsorted(index, ts)
+            temp[i, cols] = df["temperature"].to_numpy(float)
+            occ[i, cols] = df["occupancy"].to_numpy() == 1
+        return pd.DatetimeIndex(index), temp, occ
+
+    def window(self, days=None):
+        """(start, end) covering the last `days` days of data, or all of it;
+        never starts before the first reading."""
+        if len(self.index) == 0:
+            return None, None
+        end = self.index[-1] + pd.Timedelta(hours=self.step_hours)
+        if days is None:
+            return self.index[0], end
+        return max(self.index[0], end - pd.Timedelta(days=days)), end
+
+    def _slice(self, start, end):
+        lo = 0 if start is None else self.index.searchsorted(pd.Timestamp(start))
+        hi = len(self.index) if end is None else self.index.searchsorted(pd.Timestamp(end))
+        return int(lo), int(hi)
+
+    def _room_sums(self, lo, hi, threshold):
+        """(rooms × 5) sums over columns lo:hi – the only pass over the raw data."""
+        temp = self.temp[:, lo:hi]
+        occ = self.occ[:, lo:hi]
+        with np.errstate(invalid="ignore"):
+            hot = occ & (temp > threshold)
+        occ_temp = occ & ~np.isnan(temp)
+        return np.column_stack([
+            occ.sum(axis=1),
+            hot.sum(axis=1),
+            (np.fmax(temp - threshold, 0.0) * occ).sum(axis=1),
+            np.where(occ_temp, temp, 0.0).sum(axis=1),
+            occ_temp.sum(axis=1),
+        ]), np.fmax.reduce(temp, axis=1, initial=-np.inf)
+
+    def metrics(self, start=None, end=None, threshold=DEFAULT_THRESHOLD):
+        """DataFrame of METRICS per AC unit for [start, end); cached per window."""
+        lo, hi = self._slice(start, end)
+        key = (lo, hi, float(threshold))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._cache[key] = self._compute(lo, hi, float(threshold))
+            while len(self._cache) > MAX_CACHED_WINDOWS:
+                self._cache.popitem(last=False)
+        return self._cache[key].copy()
+
+    def _compute(self, lo, hi, threshold):
+        if hi <= lo or self.step_hours == 0:
+            # Empty (or backwards) window: no rows rather than NaN utilization
+            return pd.DataFrame(columns=METRICS, index=pd.Index([], name="ac_unit"))
+        sums, peak = self._room_sums(lo, hi, threshold)
+        m = self.membership
+        served = m.sum(axis=1)
+        occupied, hot, degree, temp_sum, temp_n = (m @ sums).T
+
+        dt = self.step_hours
+        window_hours = (hi - lo) * dt
+        peak_by_unit = np.where(m > 0, peak[None, :], -np.inf).max(axis=1, initial=-np.inf)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            df = pd.DataFrame({
+                "rooms": served.astype(int),
+                "occupied_hours": occupied * dt,
+                "utilization": occupied * dt / (served * window_hours),
+                "hot_occupied_hours": hot * dt,
+                "degree_hours": degree * dt,
+                "mean_occupied_temp": temp_sum / temp_n,
+                "peak_temp": np.where(np.isfinite(peak_by_unit), peak_by_unit, np.nan),
+            }, index=pd.Index(self.units, name="ac_unit"))
+        return df[METRICS]
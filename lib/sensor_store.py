@@ -0,0 +1,188 @@
+"""
+Building-partitioned store for the room-level sensor CSVs.
+
+Layout on disk (one folder per building / site):
+
+    sensor_outputs/
+    ├── B1/room_101_timeseries.csv
+    ├── B1/room_102_timeseries.csv
+    └── B2/room_101_timeseries.csv
+
+Each building is an independent partition: it is loaded on first use,
+kept in an LRU cache of MAX_BUILDINGS partitions and can be evicted on
+its own.  Room numbers are
+only unique *within* a building, so every lookup is keyed by
+(building, room).  CSVs sitting directly in the root folder (the old
+single-building layout) are treated as DEFAULT_BUILDING.
+
+Objects derived from a building's tables (e.g. analytics engines) are
+cached inside the same entry via derived(), so they are evicted with the
+building and rebuilt when its files change on disk.
+"""
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+DEFAULT_BUILDING = "B1"
+CSV_SUFFIX = "_timeseries.csv"
+# How many buildings stay loaded at once; set SENSOR_CACHE_BUILDINGS to size it
+MAX_BUILDINGS = int(os.getenv("SENSOR_CACHE_BUILDINGS", "16"))
+BUILDING_ID = re.compile(r"^\s*(?:building|site|b)?\s*#?\s*(\d+)\s*$", re.I)
+AC_UNIT_ID = re.compile(
+    r"^\s*(?:air[\s-]*con(?:dition(?:ing|er)?)?(?:[\s-]*unit)?|ac(?:[\s-]*unit)?|unit)?[\s#-]*(\d+)\s*$",
+    re.I,
+)
+
+
+def normalize_building(value):
+    """'b2' / 'Building 2' / 'site #2' / 2 → 'B2'; None / '' / 'null' → None.
+    Anything else is returned stripped, so callers can report it as unknown."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.lower() in ("", "null", "none"):
+        return None
+    m = BUILDING_ID.match(value)
+    return f"B{int(m.group(1))}" if m else value
+
+
+def normalize_ac_unit(value):
+    """'ac 1' / 'unit 1' / 'air conditioning unit 1' / 1 → 'AC1';
+    None / '' / 'null' → None.  Anything else is returned stripped."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if value.lower() in ("", "null", "none"):
+        return None
+    m = AC_UNIT_ID.match(value)
+    return f"AC{int(m.group(1))}" if m else value
+
+
+def room_from_filename(fname):
+    """room_101_timeseries.csv → '101'"""
+    return fname[len("room_"):-len(CSV_SUFFIX)]
+
+
+class SensorStore:
+    def __init__(self, folder="sensor_outputs", max_buildings=MAX_BUILDINGS, workers=8):
+        self.folder = folder
+        self.max_buildings = max_buildings
+        self.workers = workers
+        self._cache = OrderedDict()          # building → {"version", "tables", "derived"}
+        self._lock = threading.Lock()
+
+    # ───── Partition discovery ─────
+    def _partition_dir(self, building):
+        path = os.path.join(self.folder, building)
+        if os.path.isdir(path):
+            return path
+        if building == DEFAULT_BUILDING:
+            return self.folder               # legacy flat layout
+        return None
+
+    def _csv_files(self, path):
+        return sorted(
+            f for f in os.listdir(path)
+            if f.startswith("room_") and f.endswith(CSV_SUFFIX)
+        )
+
+    def buildings(self):
+        """All building ids that have a partition on disk."""
+        if not os.path.isdir(self.folder):
+            return []
+        found = {
+            d for d in os.listdir(self.folder)
+            if os.path.isdir(os.path.join(self.folder, d))
+            and self._csv_files(os.path.join(self.folder, d))
+        }
+        if self._csv_files(self.folder):
+            found.add(DEFAULT_BUILDING)
+        return sorted(found)
+
+    def version(self, building):
+        """Cheap fingerprint of a partition's files: changes whenever the
+        generator (or anything else) rewrites, adds or removes a CSV."""
+        path = self._partition_dir(building)
+        if path is None:
+            return None
+        stats = [os.stat(os.path.join(path, f)) for f in self._csv_files(path)]
+        return (
+            len(stats),
+            max((s.st_mtime_ns for s in stats), default=0),
+            sum(s.st_size for s in stats),
+        )
+
+    def rooms(self, building):
+        """Room numbers of one building, without loading the data."""
+        path = self._partition_dir(building)
+        if path is None:
+            return []
+        return [room_from_filename(f) for f in self._csv_files(path)]
+
+    # ───── Loading / caching ─────
+    def _read_partition(self, building):
+        path = self._partition_dir(building)
+        if path is None:
+            return {}
+        files = self._csv_files(path)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            frames = pool.map(
+                lambda f: pd.read_csv(os.path.join(path, f), parse_dates=["timestamp"]),
+                files,
+            )
+            return {room_from_filename(f): df for f, df in zip(files, frames)}
+
+    def _entry(self, building):
+        version = self.version(building)
+        with self._lock:
+            entry = self._cache.get(building)
+            if entry is not None and entry["version"] == version:
+                self._cache.move_to_end(building)
+                return entry
+
+        entry = {"version": version, "tables": self._read_partition(building), "derived": {}}
+
+        with self._lock:
+            self._cache[building] = entry
+            self._cache.move_to_end(building)
+            while len(self._cache) > self.max_buildings:
+                self._cache.popitem(last=False)
+        return entry
+
+    def tables(self, building):
+        """{room: DataFrame} for one building, (re)loading it if needed."""
+        return self._entry(building)["tables"]
+
+    def derived(self, building, name, factory, key=None):
+        """factory(tables), cached with the building under `name`.  Rebuilt
+        when the partition changes on disk or `key` differs from last time."""
+        entry = self._entry(building)
+        with self._lock:
+            hit = entry["derived"].get(name)
+            if hit is not None and hit[0] == key:
+                return hit[1]
+        value = factory(entry["tables"])
+        with self._lock:
+            entry["derived"][name] = (key, value)
+        return value
+
+    def fan_out(self, fn, buildings=None):
+        """[fn(building), ...] for several buildings in parallel, in order.
+        At most `workers` buildings are in flight at once, so a question over
+        dozens of sites loads them concurrently without holding every one."""
+        buildings = self.buildings() if buildings is None else list(buildings)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(fn, buildings))
+
+    def evict(self, building=None):
+        """Drop one building from the cache, or all of them, together
+        with everything derived() from it."""
+        with self._lock:
+            if building is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(building, None)